@@ -3,15 +3,16 @@ MCP Client - Connect to Local Banking MCP Server
 =================================================
 
 This demonstrates how to use Microsoft Agent Framework to connect
-to a LOCAL MCP server using MCPStdioTool.
+to a LOCAL MCP server. The server is launched once as a subprocess
+serving MCP over HTTP on localhost, and reached with MCPStreamableHTTPTool.
 
 ARCHITECTURE:
 ┌─────────────────────────────────────────────────────────────────┐
 │                        Your Application                         │
 ├─────────────────────────────────────────────────────────────────┤
 │                                                                 │
-│   ┌─────────────┐      MCPStdioTool       ┌─────────────────┐  │
-│   │   Agent     │ ◄──── stdin/stdout ───► │  local_mcp_     │  │
+│   ┌─────────────┐  MCPStreamableHTTPTool  ┌─────────────────┐  │
+│   │   Agent     │ ◄── HTTP (localhost) ─► │  local_mcp_     │  │
 │   │  (GPT-4)    │                         │  server.py      │  │
 │   └─────────────┘                         └─────────────────┘  │
 │         │                                         │             │
@@ -38,210 +39,177 @@ SETUP:
 
 import asyncio
 import os
+import socket
 import sys
+import tempfile
+from contextlib import AsyncExitStack
 from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
+# Configuration - read once from the environment
+PROJECT_ENDPOINT = os.getenv("AZURE_AI_PROJECT_ENDPOINT")
+MODEL_DEPLOYMENT_NAME = os.getenv("AZURE_AI_MODEL_DEPLOYMENT_NAME", "gpt-4o-mini")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# Local MCP server over HTTP (see MCP_TRANSPORT in local_mcp_server.py)
+MCP_HOST = "127.0.0.1"
+MCP_PORT = os.getenv("MCP_PORT")  # Optional override; otherwise a free port is picked
+
+
+def pick_port():
+    """Return MCP_PORT if set, otherwise a currently free port on MCP_HOST."""
+    if MCP_PORT:
+        return int(MCP_PORT)
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((MCP_HOST, 0))
+        return sock.getsockname()[1]
+
+
+async def start_http_server(server_path, port, log_file):
+    """Launch local_mcp_server.py as a subprocess serving MCP over HTTP."""
+    return await asyncio.create_subprocess_exec(
+        sys.executable,  # Python interpreter
+        str(server_path),  # The server script
+        env={**os.environ, "MCP_TRANSPORT": "http", "MCP_PORT": str(port)},
+        # Keep the banner and server logs out of the example output;
+        # stderr is captured so it can be shown if startup fails
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=log_file,
+    )
+
+
+async def wait_for_server(process, port, timeout=15.0):
+    """Wait until the server accepts TCP connections on MCP_HOST:port."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        if process.returncode is not None:
+            raise RuntimeError(f"MCP server exited with code {process.returncode}")
+        try:
+            _, writer = await asyncio.open_connection(MCP_HOST, port)
+        except OSError:
+            if loop.time() > deadline:
+                raise TimeoutError(f"MCP server did not start on {MCP_HOST}:{port}")
+            await asyncio.sleep(0.1)
+        else:
+            writer.close()
+            await writer.wait_closed()
+            return
+
 
+async def stop_http_server(process):
+    """Terminate the server subprocess if it is still running."""
+    if process.returncode is None:
+        process.terminate()
+        await process.wait()
 
-async def example_1_with_azure():
+
+async def example_1_with_azure(agent):
     """
     Example 1: Connect to local MCP server using Azure AI Foundry.
     """
-    from agent_framework import Agent, MCPStdioTool
-    from agent_framework.azure import AzureAIAgentClient
-    from azure.identity.aio import AzureCliCredential
-
     print("=" * 60)
     print("Example 1: Local MCP Server with Azure AI Foundry")
     print("=" * 60)
 
-    # Path to the local MCP server
-    server_path = Path(__file__).parent / "local_mcp_server.py"
-    
-    if not server_path.exists():
-        print(f"❌ Server not found: {server_path}")
-        return
-
-    async with (
-        AzureCliCredential() as credential,
-        
-        # MCPStdioTool launches the server as a subprocess
-        MCPStdioTool(
-            name="banking_tools",
-            command=sys.executable,  # Python interpreter
-            args=[str(server_path)],  # The server script
-            # Optional: Pass environment variables to the server
-            env={"PYTHONUNBUFFERED": "1"},
-        ) as mcp_server,
+    # Test questions that will use the MCP tools
+    questions = [
+        "What's my account balance?",
+        "Show me my recent transactions",
+        "How much did I spend on entertainment?",
+        "If I take a $200,000 mortgage at 6.5% for 30 years, what's my monthly payment?",
+    ]
+
+    # The first run creates the server-side Foundry agent lazily, so it runs
+    # alone; concurrent first runs could each create one and leak all but one.
+    first, *rest = questions
+    first_result = await agent.run(first)
+
+    # The remaining questions are independent, so run them concurrently.
+    # The semaphore caps in-flight requests to stay under rate limits.
+    semaphore = asyncio.Semaphore(4)
+
+    async def ask(question):
+        async with semaphore:
+            return await agent.run(question)
+
+    results = [first_result, *await asyncio.gather(*(ask(question) for question in rest))]
+
+    for question, result in zip(questions, results):
+        print(f"\n{'─' * 50}")
+        print(f"👤 User: {question}")
+        print(f"{'─' * 50}")
         
-        Agent(
-            client=AzureAIAgentClient(
-                credential=credential,
-                project_endpoint=os.getenv("AZURE_AI_PROJECT_ENDPOINT"),
-                model_deployment_name=os.getenv("AZURE_AI_MODEL_DEPLOYMENT_NAME", "gpt-4o-mini")
-            ),
-            name="BankingAssistant",
-            instructions="""
-            You are a helpful banking assistant.
-            Use the available tools to help users with their banking needs.
-            Always be clear and provide specific numbers when discussing finances.
-            """,
-            tools=[mcp_server]  # Pass the MCP server as tools
-        ) as agent,
-    ):
-        # Test questions that will use the MCP tools
-        questions = [
-            "What's my account balance?",
-            "Show me my recent transactions",
-            "How much did I spend on entertainment?",
-            "If I take a $200,000 mortgage at 6.5% for 30 years, what's my monthly payment?",
-        ]
-
-        for question in questions:
-            print(f"\n{'─' * 50}")
-            print(f"👤 User: {question}")
-            print(f"{'─' * 50}")
-            
-            result = await agent.run(question)
-            print(f"\n🤖 Agent: {result.text}")
+        print(f"\n🤖 Agent: {result.text}")
 
     print("\n✅ Example 1 completed!")
 
 
-async def example_2_with_openai():
+async def example_2_with_openai(agent):
     """
     Example 2: Connect to local MCP server using OpenAI directly.
     
     This doesn't require Azure - just an OpenAI API key.
     """
-    from agent_framework import ChatAgent, MCPStdioTool
-    from agent_framework.openai import OpenAIChatClient
-
     print("\n" + "=" * 60)
     print("Example 2: Local MCP Server with OpenAI")
     print("=" * 60)
 
-    if not os.getenv("OPENAI_API_KEY"):
-        print("⚠️ OPENAI_API_KEY not set, skipping this example")
-        return
-
-    server_path = Path(__file__).parent / "local_mcp_server.py"
-
-    async with MCPStdioTool(
-        name="banking_tools",
-        command=sys.executable,
-        args=[str(server_path)],
-    ) as mcp_server:
-        
-        # Create OpenAI chat client
-        client = OpenAIChatClient(
-            model_id="gpt-4o-mini",
-            api_key=os.getenv("OPENAI_API_KEY"),
-        )
-        
-        # Create agent with the MCP tools
-        agent = ChatAgent(
-            chat_client=client,
-            name="BankingBot",
-            instructions="You are a helpful banking assistant. Use the tools to answer questions.",
-            tools=mcp_server,  # Can pass single tool or list
-        )
-        
-        # Test
-        result = await agent.run("What's my balance and show me my cards?")
-        print(f"\n🤖 Agent: {result.text}")
+    # Test
+    result = await agent.run("What's my balance and show me my cards?")
+    print(f"\n🤖 Agent: {result.text}")
 
     print("\n✅ Example 2 completed!")
 
 
-async def example_3_multiple_mcp_servers():
+async def example_3_multiple_mcp_servers(agent):
     """
     Example 3: Connect to MULTIPLE local MCP servers.
     
     This shows how you can combine tools from different servers.
     """
-    from agent_framework import ChatAgent, MCPStdioTool
-    from agent_framework.openai import OpenAIChatClient
-
     print("\n" + "=" * 60)
     print("Example 3: Multiple MCP Servers")
     print("=" * 60)
 
-    if not os.getenv("OPENAI_API_KEY"):
-        print("⚠️ OPENAI_API_KEY not set, skipping this example")
-        return
-
-    server_path = Path(__file__).parent / "local_mcp_server.py"
-
-    # You can connect to multiple MCP servers
-    async with (
-        MCPStdioTool(
-            name="banking",
-            command=sys.executable,
-            args=[str(server_path)],
-        ) as banking_mcp,
-        
-        # You could add more servers here:
-        # MCPStdioTool(
-        #     name="calculator",
-        #     command="uvx",
-        #     args=["mcp-server-calculator"],
-        # ) as calc_mcp,
-    ):
-        client = OpenAIChatClient(
-            model_id="gpt-4o-mini",
-            api_key=os.getenv("OPENAI_API_KEY"),
-        )
-        
-        # Combine tools from multiple servers
-        # all_tools = [*banking_mcp.functions, *calc_mcp.functions]
-        all_tools = banking_mcp  # Just banking for now
-        
-        agent = ChatAgent(
-            chat_client=client,
-            name="MultiToolAgent",
-            instructions="You have access to banking tools. Help the user.",
-            tools=all_tools,
-        )
-        
-        result = await agent.run("Give me a spending summary")
-        print(f"\n🤖 Agent: {result.text}")
+    # You can connect to multiple MCP servers. Open extra servers in main()
+    # next to the banking one and add them to the agent's tools, e.g.:
+    # MCPStdioTool(
+    #     name="calculator",
+    #     command="uvx",
+    #     args=["mcp-server-calculator"],
+    # ) as calc_mcp,
+    #
+    # Combine tools from multiple servers
+    # tools=[*mcp_server.functions, *calc_mcp.functions]
+    # Just banking for now, so the shared agent from main() already has them.
+    
+    result = await agent.run("Give me a spending summary")
+    print(f"\n🤖 Agent: {result.text}")
 
     print("\n✅ Example 3 completed!")
 
 
-async def example_4_list_tools():
+async def example_4_list_tools(tool_list):
     """
     Example 4: Just list the tools available from the MCP server.
     
     Useful for debugging and understanding what's available.
+    Takes the (name, description) pairs snapshotted in main(), so no
+    extra MCP round-trip is needed.
     """
-    from agent_framework import MCPStdioTool
-
     print("\n" + "=" * 60)
     print("Example 4: List Available Tools")
     print("=" * 60)
 
-    server_path = Path(__file__).parent / "local_mcp_server.py"
-
-    async with MCPStdioTool(
-        name="banking_tools",
-        command=sys.executable,
-        args=[str(server_path)],
-    ) as mcp_server:
-        
-        print("\n📋 Tools available from the MCP server:\n")
-        
-        # The MCP server exposes tools as functions
-        for func in mcp_server.functions:
-            print(f"  🔧 {func.name}")
-            if func.description:
-                # Print first line of description
-                desc = func.description.split('\n')[0].strip()
-                print(f"     {desc}")
-            print()
+    print("\n📋 Tools available from the MCP server:\n")
+    
+    for name, desc in tool_list:
+        print(f"  🔧 {name}")
+        if desc:
+            print(f"     {desc}")
+        print()
 
     print("✅ Example 4 completed!")
 
@@ -254,8 +222,8 @@ async def main():
     print("🚀" * 20)
     
     # Check configuration
-    has_azure = bool(os.getenv("AZURE_AI_PROJECT_ENDPOINT"))
-    has_openai = bool(os.getenv("OPENAI_API_KEY"))
+    has_azure = bool(PROJECT_ENDPOINT)
+    has_openai = bool(OPENAI_API_KEY)
     
     print(f"\n📋 Configuration:")
     print(f"   Azure AI Foundry: {'✅ Configured' if has_azure else '❌ Not set'}")
@@ -273,34 +241,128 @@ Or:
   export OPENAI_API_KEY="sk-..."
         """)
         
-        # Still run example 4 (no API needed)
-        print("Running Example 4 only (no API required)...")
-        try:
-            await example_4_list_tools()
-        except Exception as e:
-            print(f"❌ Example 4 failed: {e}")
-        return
+    # Path to the local MCP server
+    server_path = Path(__file__).parent / "local_mcp_server.py"
     
-    # Run examples based on available credentials
-    if has_azure:
+    if not server_path.exists():
+        print(f"❌ Server not found: {server_path}")
+        return
+
+    from agent_framework import MCPStreamableHTTPTool
+
+    async with AsyncExitStack() as stack:
+        # Launch the server once over HTTP and share it across all examples
+        server_log = stack.enter_context(tempfile.TemporaryFile())
         try:
-            await example_1_with_azure()
+            port = pick_port()
+            process = await start_http_server(server_path, port, server_log)
+            stack.push_async_callback(stop_http_server, process)
+            await wait_for_server(process, port)
+
+            mcp_server = await stack.enter_async_context(MCPStreamableHTTPTool(
+                name="banking_tools",
+                url=f"http://{MCP_HOST}:{port}/mcp",
+            ))
+
+            # Make sure we reached our own server, not another one on the port
+            if process.returncode is not None:
+                raise RuntimeError(f"MCP server exited with code {process.returncode}")
         except Exception as e:
-            print(f"\n❌ Example 1 failed: {e}")
-            import traceback
-            traceback.print_exc()
-    
-    if has_openai:
+            print(f"\n❌ Could not start the local MCP server: {e}")
+            server_log.seek(0)
+            output = server_log.read().decode(errors="replace").strip()
+            if output:
+                print(f"\nServer output:\n{output}")
+            return
+        
+        # The tool list is static, so snapshot it once after discovery.
+        # Keep the first line of each description.
+        tool_list = [
+            (func.name, (func.description or "").split('\n')[0].strip())
+            for func in mcp_server.functions
+        ]
+        
+        if not has_azure and not has_openai:
+            # Still run example 4 (no API needed)
+            print("Running Example 4 only (no API required)...")
+            try:
+                await example_4_list_tools(tool_list)
+            except Exception as e:
+                print(f"❌ Example 4 failed: {e}")
+            return
+        
+        # Create credentials, chat clients and one agent per model once, so
+        # token acquisition, HTTP connection pools and agent setup are reused
+        # across examples. The agents are not used as context managers: that
+        # would re-enter the shared MCP server and close it on exit.
+        # If a provider fails to set up, report it and skip its examples.
+        if has_azure:
+            try:
+                from agent_framework import Agent
+                from agent_framework.azure import AzureAIAgentClient
+                from azure.identity.aio import AzureCliCredential
+
+                credential = await stack.enter_async_context(AzureCliCredential())
+                azure_client = await stack.enter_async_context(AzureAIAgentClient(
+                    credential=credential,
+                    project_endpoint=PROJECT_ENDPOINT,
+                    model_deployment_name=MODEL_DEPLOYMENT_NAME
+                ))
+                azure_agent = Agent(
+                    client=azure_client,
+                    name="BankingAssistant",
+                    instructions="""
+                    You are a helpful banking assistant.
+                    Use the available tools to help users with their banking needs.
+                    Always be clear and provide specific numbers when discussing finances.
+                    """,
+                    tools=[mcp_server]  # Pass the MCP server as tools
+                )
+            except Exception as e:
+                print(f"\n❌ Example 1 failed: {e}")
+                import traceback
+                traceback.print_exc()
+                has_azure = False
+
+        if has_openai:
+            try:
+                from agent_framework import ChatAgent
+                from agent_framework.openai import OpenAIChatClient
+
+                openai_client = OpenAIChatClient(
+                    model_id="gpt-4o-mini",
+                    api_key=OPENAI_API_KEY,
+                )
+                openai_agent = ChatAgent(
+                    chat_client=openai_client,
+                    name="BankingBot",
+                    instructions="You are a helpful banking assistant. Use the tools to answer questions.",
+                    tools=mcp_server,  # Can pass single tool or list
+                )
+            except Exception as e:
+                print(f"\n❌ Example 2 failed: {e}")
+                has_openai = False
+        
+        # Run examples based on available credentials
+        if has_azure:
+            try:
+                await example_1_with_azure(azure_agent)
+            except Exception as e:
+                print(f"\n❌ Example 1 failed: {e}")
+                import traceback
+                traceback.print_exc()
+        
+        if has_openai:
+            try:
+                await example_2_with_openai(openai_agent)
+            except Exception as e:
+                print(f"\n❌ Example 2 failed: {e}")
+        
+        # Always run tool listing (no API needed)
         try:
-            await example_2_with_openai()
+            await example_4_list_tools(tool_list)
         except Exception as e:
-            print(f"\n❌ Example 2 failed: {e}")
-    
-    # Always run tool listing (no API needed)
-    try:
-        await example_4_list_tools()
-    except Exception as e:
-        print(f"\n❌ Example 4 failed: {e}")
+            print(f"\n❌ Example 4 failed: {e}")
     
     print("\n👋 Done!")
 
@@ -32,139 +32,123 @@ MODEL_DEPLOYMENT_NAME = os.getenv("AZURE_AI_MODEL_DEPLOYMENT_NAME", "gpt-4o-mini
 
 
 
-async def example_1_basic_hosted_mcp():
+async def example_1_basic_hosted_mcp(mcp_tool, client):
     """
     Agent searches Microsoft Learn documentation.
     """
-    # UPDATED IMPORTS - Use MCPStreamableHTTPTool instead
-    from agent_framework import Agent, MCPStreamableHTTPTool
-    from agent_framework.azure import AzureAIAgentClient
-    from azure.identity.aio import AzureCliCredential
+    from agent_framework import Agent
 
     print("="*60)
     
-    async with(
-        AzureCliCredential() as credential,
-        # Use MCPStreamableHTTPTool as context manager
-        MCPStreamableHTTPTool(
-            name="microsoft_learn",
-            description="Search Microsoft Learn documentation for Azure",
-            url="https://learn.microsoft.com/api/mcp",
-            # approval_mode parameter may vary by version
-        ) as mcp_tool,
-        Agent(
-            client=AzureAIAgentClient(credential=credential, project_endpoint=PROJECT_ENDPOINT, model_deployment_name=MODEL_DEPLOYMENT_NAME),
-            name="DocAssistant",
-            instructions="""
-            You are a Microsoft documentation assistant.
-            Use the Microsoft Learn search tool to find accurate answers.
-            Always provide the source URL when answering.
-            If you can't find relevant information, say so clearly.
-            """,
-            tools=[mcp_tool]  # Pass the tool object here
-        ) as agent,
-    ):
-        questions = [
-            "How do I create an Azure Storage account using Azure CLI?",
-            "What is the difference between Azure AD and Microsoft Entra ID?",
-        ]
-
-        for question in questions:
-            print(f"\nUser: {question}")
-            result = await agent.run(question)
-            print(f"\nAgent: {result.text[:500]}")    
-
-async def example_2_alternative_pattern():
+    # The MCP tool and client are opened once in main() and shared, so the
+    # agent is not used as a context manager (that would close them on exit)
+    agent = Agent(
+        client=client,
+        name="DocAssistant",
+        instructions="""
+        You are a Microsoft documentation assistant.
+        Use the Microsoft Learn search tool to find accurate answers.
+        Always provide the source URL when answering.
+        If you can't find relevant information, say so clearly.
+        """,
+        tools=[mcp_tool]  # Pass the tool object here
+    )
+
+    questions = [
+        "How do I create an Azure Storage account using Azure CLI?",
+        "What is the difference between Azure AD and Microsoft Entra ID?",
+    ]
+
+    # Sequential on purpose: the first run lazily creates the server-side
+    # Foundry agent, and concurrent first runs could each create (and leak) one.
+    for question in questions:
+        print(f"\nUser: {question}")
+        result = await agent.run(question)
+        print(f"\nAgent: {result.text[:500]}")
+
+async def example_2_alternative_pattern(mcp_tool, client):
     """
     Create MCP tool outside the agent.
     This pattern is useful when you need to :
     - Reuse the samae MCP connection for multiple agents
     - Have more control over the tool lifecycle
     """
-    from agent_framework import Agent, MCPStreamableHTTPTool
-    from agent_framework.azure import AzureAIAgentClient
-    from azure.identity.aio import AzureCliCredential
+    from agent_framework import Agent
 
     print("Example 2: Alternative Pattern")
     print("=" * 60)
 
-    async with AzureCliCredential() as credential:
-        client = AzureAIAgentClient(
-            credential = credential,
-            project_endpoint = PROJECT_ENDPOINT,
-            model_deployment_name = MODEL_DEPLOYMENT_NAME
-        )
-        #Create MCP tool with explicit lifecycle management
-        async with MCPStreamableHTTPTool(
-            name = "microsoft_learn",
-            url ="https://learn.microsoft.com/api/mcp",
-        ) as mcp_tool:
-
-        #create agent using the tool
-            agent = Agent(
-                client = client,
-                name = "DocBot",
-                instructions ="You help with Microsoft documentation questions",
-                tools = [mcp_tool],
-            )
-
-        questions = [
-            "How do I create an Azure Storage account using Azure CLI?",
-            "What is the difference between Azure AD and Microsoft Entra ID?",
-        ]
-
-        for question in questions:
-            print(f"\nUser: {question}")
-            result = await agent.run(question)
-            print(f"\nAgent: {result.text[:500]}")
-
-async def example_3_hosted_mcp_tool():
+    # mcp_tool is created in main() with explicit lifecycle management
+    #create agent using the tool
+    agent = Agent(
+        client = client,
+        name = "DocBot",
+        instructions ="You help with Microsoft documentation questions",
+        tools = [mcp_tool],
+    )
+
+    questions = [
+        "How do I create an Azure Storage account using Azure CLI?",
+        "What is the difference between Azure AD and Microsoft Entra ID?",
+    ]
+
+    for question in questions:
+        print(f"\nUser: {question}")
+        result = await agent.run(question)
+        print(f"\nAgent: {result.text[:500]}")
+
+async def example_3_hosted_mcp_tool(mcp_tool, client):
     """
     Hosted MCP Tool Example: content from Microsoft Learn
     """
-    from agent_framework import Agent, MCPStreamableHTTPTool
-    from agent_framework.azure import AzureAIAgentClient
-    from azure.identity.aio import AzureCliCredential
-
-    async with (
-        AzureCliCredential() as credential,
-        MCPStreamableHTTPTool(
-            name = "microsoft_learn",
-            description = "Search Microsoft learn documentation",
-            url = "https://learn.microsoft.com/api/mcp",
-            approval_mode = "never_require"
-        ) as mcp_tool,
-        Agent(
-            client = AzureAIAgentClient(
-                credential = credential,
-                project_endpoint = PROJECT_ENDPOINT,
-                model_deployment_name = MODEL_DEPLOYMENT_NAME
-            ),
-            name = "ManageDocAssistant",
-            instructions = """
-            You are a documentation assistant with access to Microsoft Learn.
-            Search for accurate information and cite your sources.
-            """,
-            tools = [mcp_tool]
-        ) as agent,
-    ):
-        result = await agent.run("What is Azure Kubernetes Service?")
-        response = result.text
-        if len(response) > 500:
-            response = response[:500] + "..."
-        print(f"\nAgent: {response}")
+    from agent_framework import Agent
+
+    agent = Agent(
+        client = client,
+        name = "ManageDocAssistant",
+        instructions = """
+        You are a documentation assistant with access to Microsoft Learn.
+        Search for accurate information and cite your sources.
+        """,
+        tools = [mcp_tool]
+    )
+    result = await agent.run("What is Azure Kubernetes Service?")
+    response = result.text
+    if len(response) > 500:
+        response = response[:500] + "..."
+    print(f"\nAgent: {response}")
 
 async def main():
-    if not os.getenv("AZURE_AI_PROJECT_ENDPOINT"):
+    if not PROJECT_ENDPOINT:
         print("Azure AI Foundry not configured!")
         return
 
+    from agent_framework import MCPStreamableHTTPTool
+    from agent_framework.azure import AzureAIAgentClient
+    from azure.identity.aio import AzureCliCredential
+
     try:
         #print (os.getenv("AZURE_AI_PROJECT_ENDPOINT"))
         #print (os.getenv("AZURE_AI_MODEL_DEPLOYMENT_NAME"))
-        #await example_1_basic_hosted_mcp()
-        #await example_2_alternative_pattern()
-        await example_3_hosted_mcp_tool()
+        # Open the credential, MCP connection and client once and share
+        # them across all examples
+        async with (
+            AzureCliCredential() as credential,
+            MCPStreamableHTTPTool(
+                name = "microsoft_learn",
+                description = "Search Microsoft Learn documentation",
+                url = "https://learn.microsoft.com/api/mcp",
+                approval_mode = "never_require"
+            ) as mcp_tool,
+            AzureAIAgentClient(
+                credential = credential,
+                project_endpoint = PROJECT_ENDPOINT,
+                model_deployment_name = MODEL_DEPLOYMENT_NAME
+            ) as client,
+        ):
+            #await example_1_basic_hosted_mcp(mcp_tool, client)
+            #await example_2_alternative_pattern(mcp_tool, client)
+            await example_3_hosted_mcp_tool(mcp_tool, client)
     except Exception as e:
         print(f"Example failed: {e}")
         import traceback
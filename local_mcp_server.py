@@ -12,27 +12,44 @@ TWO WAYS TO BUILD MCP SERVERS:
 HOW IT WORKS:
 ┌─────────────────┐         STDIO          ┌─────────────────┐
 │   MCP Client    │ ◄──── stdin/stdout ───► │   MCP Server    │
-│ (Agent Framework)│                        │ (This file)     │
+│ (Agent Framework)│   or HTTP (localhost)  │ (This file)     │
 └─────────────────┘                         └─────────────────┘
 
 SETUP:
     pip install fastmcp
+    pip install orjson  # Optional: faster JSON for tool results
 
 RUN (for testing):
-    python local_mcp_server.py
+    python local_mcp_server.py                                   # STDIO mode
+    MCP_TRANSPORT=http MCP_PORT=8765 python local_mcp_server.py  # HTTP mode
 
 USE WITH AGENT:
     See client_local_mcp.py
 """
 
+from collections import defaultdict
 from fastmcp import FastMCP
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+import os
+import sys
+import time
+from typing import Literal, Optional, get_args
+
+try:
+    import orjson
+except ImportError:  # Optional: FastMCP falls back to its default JSON serializer
+    orjson = None
 
 # =============================================================================
 # CREATE THE MCP SERVER
 # =============================================================================
 
+def _orjson_serializer(data) -> str:
+    """Serialize tool results with orjson (C-backed, faster than stdlib json)."""
+    return orjson.dumps(data, default=str).decode()
+
+
 mcp = FastMCP(
     name="BankingToolsServer",
     instructions="""
@@ -40,8 +57,10 @@ mcp = FastMCP(
     - Check account balance
     - List transactions
     - Get payment methods
-    - Calculate loan payments
-    """
+    - Calculate loan payments and amortization schedules
+    Tool descriptions are short; call get_tool_schema for full details.
+    """,
+    tool_serializer=_orjson_serializer if orjson else None,
 )
 
 # =============================================================================
@@ -67,6 +86,221 @@ PAYMENT_METHODS = [
     {"type": "bank_account", "name": "Checking", "last_four": "1234", "is_default": False},
 ]
 
+# Field names accepted by the "fields" projection; as a Literal, FastMCP
+# validates the input and advertises the allowed names in the tool schema
+TransactionField = Literal["date", "amount", "merchant", "category"]
+TRANSACTION_FIELDS = list(get_args(TransactionField))
+
+# Column views of TRANSACTIONS, built once at import so searches don't have
+# to walk every row dict on each call.
+_CATEGORIES = [txn["category"] for txn in TRANSACTIONS]
+_MERCHANTS_LC = [txn["merchant"].lower() for txn in TRANSACTIONS]
+_AMOUNTS = [txn["amount"] for txn in TRANSACTIONS]
+_ABS_AMOUNTS = [abs(amount) for amount in _AMOUNTS]
+
+# Lowercased category -> row indexes (ascending, so results keep list order)
+_BY_CATEGORY: dict[str, list[int]] = defaultdict(list)
+for _i, _category in enumerate(_CATEGORIES):
+    _BY_CATEGORY[_category.lower()].append(_i)
+
+
+def _compute_spending_summary() -> dict:
+    """Total expenses per category over TRANSACTIONS."""
+    summary = {}
+    for category, amount in zip(_CATEGORIES, _AMOUNTS):
+        if amount < 0:  # Only expenses
+            summary[category] = summary.get(category, 0) - amount
+    
+    # Round values
+    summary = {k: round(v, 2) for k, v in summary.items()}
+    
+    return {
+        "spending_by_category": summary,
+        "total_spending": round(sum(summary.values()), 2),
+        "period": "Last 30 days"
+    }
+
+
+# TRANSACTIONS is static, so the summary only needs computing once.
+# If transactions become dynamic, refresh this with a TTL like the
+# interest-rates resource does.
+_SPENDING_SUMMARY = _compute_spending_summary()
+
+
+# =============================================================================
+# TOOL SCHEMAS (Full details, served on demand by get_tool_schema)
+# =============================================================================
+# Tool docstrings are sent to the LLM on every turn, so they are kept to a
+# one-line summary. The full description lives here instead.
+
+# Shared "fields" parameter for the transaction listing tools
+_FIELDS_PARAMETER = {
+    "type": "array",
+    "items": {"type": "string", "enum": TRANSACTION_FIELDS},
+    "description": (
+        "Only return these fields for each transaction "
+        f"(any of: {', '.join(TRANSACTION_FIELDS)}). Omit to return all fields."
+    ),
+}
+
+TOOL_SCHEMAS = {
+    "get_account_balance": {
+        "description": (
+            "Get the current balance for a bank account. Use this when the user "
+            "asks about their balance or how much money they have."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "account_id": {
+                    "type": "string",
+                    "default": "ACC001",
+                    "description": "The account identifier",
+                },
+            },
+        },
+        "returns": "Account balance information including balance, type, and owner",
+    },
+    "get_recent_transactions": {
+        "description": (
+            "Get recent transaction history. Use this when the user asks about "
+            "recent spending, transactions, or activity."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "default": 5,
+                    "description": "Maximum number of transactions to return",
+                },
+                "fields": _FIELDS_PARAMETER,
+            },
+        },
+        "returns": "List of recent transactions with date, amount, merchant, and category",
+    },
+    "search_transactions": {
+        "description": (
+            "Search transactions with filters. Use this when the user asks about "
+            "specific spending like 'How much did I spend at Starbucks?', "
+            "'Show me my restaurant expenses' or 'Find transactions over $100'."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "category": {
+                    "type": "string",
+                    "description": "Filter by category (e.g., 'Restaurant', 'Shopping')",
+                },
+                "merchant": {
+                    "type": "string",
+                    "description": "Filter by merchant name (partial match)",
+                },
+                "min_amount": {
+                    "type": "number",
+                    "description": "Minimum transaction amount (absolute value)",
+                },
+                "fields": _FIELDS_PARAMETER,
+            },
+        },
+        "returns": "List of matching transactions",
+    },
+    "get_payment_methods": {
+        "description": (
+            "Get all available payment methods. Use this when the user asks about "
+            "their cards, payment options, or how they can pay for something."
+        ),
+        "parameters": {"type": "object", "properties": {}},
+        "returns": "List of payment methods (credit cards, bank accounts)",
+    },
+    "calculate_loan_payment": {
+        "description": (
+            "Calculate monthly loan payment. Use this when the user asks about loan "
+            "calculations, mortgages, or how much their monthly payment would be."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "principal": {
+                    "type": "number",
+                    "description": "Loan amount in dollars",
+                },
+                "annual_rate": {
+                    "type": "number",
+                    "description": "Annual interest rate as percentage (e.g., 5.5 for 5.5%)",
+                },
+                "years": {
+                    "type": "integer",
+                    "description": "Loan term in years",
+                },
+            },
+            "required": ["principal", "annual_rate", "years"],
+        },
+        "returns": "Monthly payment, total payment, and total interest",
+    },
+    "amortization_schedule": {
+        "description": (
+            "Month-by-month amortization schedule for a fixed-rate loan. Use this "
+            "when the user asks how a loan is paid down over time, or how much of "
+            "each payment goes to principal versus interest."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "principal": {
+                    "type": "number",
+                    "description": "Loan amount in dollars",
+                },
+                "annual_rate": {
+                    "type": "number",
+                    "description": "Annual interest rate as percentage (e.g., 5.5 for 5.5%)",
+                },
+                "years": {
+                    "type": "integer",
+                    "description": "Loan term in years",
+                },
+            },
+            "required": ["principal", "annual_rate", "years"],
+        },
+        "returns": (
+            "List of monthly rows with month, payment, principal, interest, and "
+            "remaining balance; the last payment absorbs rounding so it ends at 0"
+        ),
+    },
+    "get_spending_summary": {
+        "description": (
+            "Get a summary of spending by category. Use this when the user asks "
+            "about where their money goes, spending breakdown, or budget analysis."
+        ),
+        "parameters": {"type": "object", "properties": {}},
+        "returns": "Dictionary with spending totals by category",
+    },
+}
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+# [monotonic time of last refresh, cached ISO timestamp]
+_NOW_ISO_CACHE = [float("-inf"), ""]
+
+
+def _cached_now_iso(ttl: float = 0.1) -> str:
+    """Return datetime.now().isoformat(), reusing the last value for `ttl` seconds."""
+    now = time.monotonic()
+    if now - _NOW_ISO_CACHE[0] > ttl:
+        _NOW_ISO_CACHE[0] = now
+        _NOW_ISO_CACHE[1] = datetime.now().isoformat()
+    return _NOW_ISO_CACHE[1]
+
+
+def _select_fields(rows: list, fields: Optional[list[TransactionField]]) -> list:
+    """Project each row down to `fields`, or return rows unchanged if not set."""
+    if not fields:
+        return rows
+    return [{k: row[k] for k in fields if k in row} for row in rows]
+
 
 # =============================================================================
 # MCP TOOLS - These are exposed to MCP clients
@@ -74,17 +308,7 @@ PAYMENT_METHODS = [
 
 @mcp.tool()
 def get_account_balance(account_id: str = "ACC001") -> dict:
-    """
-    Get the current balance for a bank account.
-    
-    Use this when the user asks about their balance or how much money they have.
-    
-    Args:
-        account_id: The account identifier (default: ACC001)
-        
-    Returns:
-        Account balance information including balance, type, and owner
-    """
+    """Get an account balance; call get_tool_schema('get_account_balance') for details"""
     account = ACCOUNTS.get(account_id)
     if account:
         return {
@@ -93,97 +317,53 @@ def get_account_balance(account_id: str = "ACC001") -> dict:
             "account_type": account["type"],
             "owner": account["owner"],
             "currency": "USD",
-            "as_of": datetime.now().isoformat()
+            "as_of": _cached_now_iso()
         }
     return {"error": f"Account {account_id} not found"}
 
 
 @mcp.tool()
-def get_recent_transactions(limit: int = 5) -> list:
-    """
-    Get recent transaction history.
-    
-    Use this when the user asks about recent spending, transactions, or activity.
-    
-    Args:
-        limit: Maximum number of transactions to return (default: 5)
-        
-    Returns:
-        List of recent transactions with date, amount, merchant, and category
-    """
-    return TRANSACTIONS[:limit]
+def get_recent_transactions(
+    limit: int = 5,
+    fields: Optional[list[TransactionField]] = None
+) -> list:
+    """Recent transactions; call get_tool_schema('get_recent_transactions') for details"""
+    return _select_fields(TRANSACTIONS[:limit], fields)
 
 
 @mcp.tool()
 def search_transactions(
     category: Optional[str] = None,
     merchant: Optional[str] = None,
-    min_amount: Optional[float] = None
+    min_amount: Optional[float] = None,
+    fields: Optional[list[TransactionField]] = None
 ) -> list:
-    """
-    Search transactions with filters.
-    
-    Use this when the user asks about specific spending like:
-    - "How much did I spend at Starbucks?"
-    - "Show me my restaurant expenses"
-    - "Find transactions over $100"
-    
-    Args:
-        category: Filter by category (e.g., "Restaurant", "Shopping")
-        merchant: Filter by merchant name (partial match)
-        min_amount: Minimum transaction amount (absolute value)
-        
-    Returns:
-        List of matching transactions
-    """
-    results = []
-    for txn in TRANSACTIONS:
-        # Apply filters
-        if category and txn["category"].lower() != category.lower():
-            continue
-        if merchant and merchant.lower() not in txn["merchant"].lower():
-            continue
-        if min_amount and abs(txn["amount"]) < min_amount:
-            continue
-        results.append(txn)
-    
-    return results
+    """Search transactions; call get_tool_schema('search_transactions') for details"""
+    # Start from the category index instead of scanning every row
+    if category:
+        candidates = _BY_CATEGORY.get(category.lower(), [])
+    else:
+        candidates = range(len(TRANSACTIONS))
+
+    # Apply remaining filters on the precomputed columns
+    if merchant:
+        merchant_lc = merchant.lower()
+        candidates = [i for i in candidates if merchant_lc in _MERCHANTS_LC[i]]
+    if min_amount:
+        candidates = [i for i in candidates if _ABS_AMOUNTS[i] >= min_amount]
+
+    return _select_fields([TRANSACTIONS[i] for i in candidates], fields)
 
 
 @mcp.tool()
 def get_payment_methods() -> list:
-    """
-    Get all available payment methods.
-    
-    Use this when the user asks about their cards, payment options,
-    or how they can pay for something.
-    
-    Returns:
-        List of payment methods (credit cards, bank accounts)
-    """
+    """List payment methods; call get_tool_schema('get_payment_methods') for details"""
     return PAYMENT_METHODS
 
 
-@mcp.tool()
-def calculate_loan_payment(
-    principal: float,
-    annual_rate: float,
-    years: int
-) -> dict:
-    """
-    Calculate monthly loan payment.
-    
-    Use this when the user asks about loan calculations, mortgages,
-    or how much their monthly payment would be.
-    
-    Args:
-        principal: Loan amount in dollars
-        annual_rate: Annual interest rate as percentage (e.g., 5.5 for 5.5%)
-        years: Loan term in years
-        
-    Returns:
-        Monthly payment, total payment, and total interest
-    """
+@lru_cache(maxsize=512)
+def _loan_core(principal: float, annual_rate: float, years: int) -> tuple[float, float, float]:
+    """Monthly payment, total payment and total interest for a fixed-rate loan."""
     # Convert annual rate to monthly rate
     monthly_rate = (annual_rate / 100) / 12
     num_payments = years * 12
@@ -192,11 +372,25 @@ def calculate_loan_payment(
     if monthly_rate == 0:
         monthly_payment = principal / num_payments
     else:
-        monthly_payment = principal * (monthly_rate * (1 + monthly_rate)**num_payments) / ((1 + monthly_rate)**num_payments - 1)
+        growth = (1 + monthly_rate)**num_payments
+        monthly_payment = principal * (monthly_rate * growth) / (growth - 1)
     
     total_payment = monthly_payment * num_payments
     total_interest = total_payment - principal
     
+    return monthly_payment, total_payment, total_interest
+
+
+@mcp.tool()
+def calculate_loan_payment(
+    principal: float,
+    annual_rate: float,
+    years: int
+) -> dict:
+    """Monthly loan payment; call get_tool_schema('calculate_loan_payment') for details"""
+    # Pure calculation, cached so agents retrying the same question skip the math
+    monthly_payment, total_payment, total_interest = _loan_core(principal, annual_rate, years)
+    
     return {
         "monthly_payment": round(monthly_payment, 2),
         "total_payment": round(total_payment, 2),
@@ -204,61 +398,101 @@ def calculate_loan_payment(
         "principal": principal,
         "annual_rate": annual_rate,
         "term_years": years,
-        "num_payments": num_payments
+        "num_payments": years * 12
     }
 
 
 @mcp.tool()
-def get_spending_summary() -> dict:
-    """
-    Get a summary of spending by category.
-    
-    Use this when the user asks about where their money goes,
-    spending breakdown, or budget analysis.
-    
-    Returns:
-        Dictionary with spending totals by category
-    """
-    summary = {}
-    for txn in TRANSACTIONS:
-        if txn["amount"] < 0:  # Only expenses
-            category = txn["category"]
-            summary[category] = summary.get(category, 0) + abs(txn["amount"])
-    
-    # Round values
-    summary = {k: round(v, 2) for k, v in summary.items()}
+def amortization_schedule(
+    principal: float,
+    annual_rate: float,
+    years: int
+) -> list | dict:
+    """Amortization table; call get_tool_schema('amortization_schedule') for details"""
+    if years <= 0:
+        return {"error": f"Loan term must be at least 1 year, got {years}"}
+
+    monthly_payment, _, _ = _loan_core(principal, annual_rate, years)
+    monthly_payment = round(monthly_payment, 2)
+    monthly_rate = (annual_rate / 100) / 12
+    num_payments = years * 12
+
+    # Work in rounded cents so the principal column sums to the loan amount
+    schedule = []
+    balance = round(principal, 2)
+    for month in range(1, num_payments + 1):
+        interest = round(balance * monthly_rate, 2)
+        if month == num_payments:
+            # Last payment absorbs rounding so the balance ends at exactly 0
+            principal_paid = balance
+        else:
+            # Never pay more than is owed (the rounded payment can overshoot)
+            principal_paid = min(round(monthly_payment - interest, 2), balance)
+        balance = round(balance - principal_paid, 2)
+        schedule.append({
+            "month": month,
+            "payment": round(principal_paid + interest, 2),
+            "principal": principal_paid,
+            "interest": interest,
+            "balance": balance
+        })
+        if balance == 0:
+            break
     
-    return {
-        "spending_by_category": summary,
-        "total_spending": round(sum(summary.values()), 2),
-        "period": "Last 30 days"
-    }
+    return schedule
+
+
+@mcp.tool()
+def get_spending_summary() -> dict:
+    """Spending by category; call get_tool_schema('get_spending_summary') for details"""
+    return _SPENDING_SUMMARY
+
+
+@mcp.tool()
+def get_tool_schema(tool_name: str) -> dict:
+    """Get the full parameter schema and usage notes for a banking tool."""
+    schema = TOOL_SCHEMAS.get(tool_name)
+    if schema:
+        return {"tool_name": tool_name, **schema}
+    return {"error": f"Tool {tool_name} not found"}
 
 
 # =============================================================================
 # MCP RESOURCES (Read-only data)
 # =============================================================================
 
+# Static resource payloads are built once and reused on every read
+_ACCOUNT_TYPES = {
+    "account_types": ["Checking", "Savings", "Money Market", "CD"],
+    "description": "Available account types at our bank"
+}
+
+# Interest rates are rebuilt at most every _RATES_TTL seconds
+_RATES_TTL = 300
+_RATES_CACHE: tuple[float, dict] = (float("-inf"), {})
+
+
 @mcp.resource("resource://account-types")
 def get_account_types() -> dict:
     """List of available account types."""
-    return {
-        "account_types": ["Checking", "Savings", "Money Market", "CD"],
-        "description": "Available account types at our bank"
-    }
+    return _ACCOUNT_TYPES
 
 
 @mcp.resource("resource://interest-rates")
 def get_interest_rates() -> dict:
     """Current interest rates."""
-    return {
-        "savings_apy": 4.5,
-        "checking_apy": 0.1,
-        "cd_12_month_apy": 5.0,
-        "mortgage_30_year": 6.75,
-        "auto_loan": 7.5,
-        "as_of": datetime.now().strftime("%Y-%m-%d")
-    }
+    global _RATES_CACHE
+    now = time.monotonic()
+    if now - _RATES_CACHE[0] > _RATES_TTL:
+        _RATES_CACHE = (now, {
+            "savings_apy": 4.5,
+            "checking_apy": 0.1,
+            "cd_12_month_apy": 5.0,
+            "mortgage_30_year": 6.75,
+            "auto_loan": 7.5,
+            "as_of": datetime.now().strftime("%Y-%m-%d")
+        })
+    return _RATES_CACHE[1]
 
 
 # =============================================================================
@@ -266,25 +500,38 @@ def get_interest_rates() -> dict:
 # =============================================================================
 
 if __name__ == "__main__":
-    print("=" * 60)
-    print("🏦 Banking MCP Server")
-    print("=" * 60)
-    print(f"Server Name: {mcp.name}")
-    print("\n📋 Available Tools:")
-    print("  • get_account_balance")
-    print("  • get_recent_transactions")
-    print("  • search_transactions")
-    print("  • get_payment_methods")
-    print("  • calculate_loan_payment")
-    print("  • get_spending_summary")
-    print("\n📚 Available Resources:")
-    print("  • resource://account-types")
-    print("  • resource://interest-rates")
-    print("\n" + "=" * 60)
-    print("Starting MCP server (STDIO mode)...")
-    print("Use Ctrl+C to stop")
-    print("=" * 60)
+    # Transport is chosen by the launcher: "stdio" (default) or "http"
+    transport = os.getenv("MCP_TRANSPORT", "stdio")
+    port = int(os.getenv("MCP_PORT", "8765"))
+    # In STDIO mode stdout carries the JSON-RPC stream, so the banner goes to stderr
+    banner = sys.stderr if transport == "stdio" else sys.stdout
+
+    print("=" * 60, file=banner)
+    print("🏦 Banking MCP Server", file=banner)
+    print("=" * 60, file=banner)
+    print(f"Server Name: {mcp.name}", file=banner)
+    print("\n📋 Available Tools:", file=banner)
+    print("  • get_account_balance", file=banner)
+    print("  • get_recent_transactions", file=banner)
+    print("  • search_transactions", file=banner)
+    print("  • get_payment_methods", file=banner)
+    print("  • calculate_loan_payment", file=banner)
+    print("  • amortization_schedule", file=banner)
+    print("  • get_spending_summary", file=banner)
+    print("  • get_tool_schema", file=banner)
+    print("\n📚 Available Resources:", file=banner)
+    print("  • resource://account-types", file=banner)
+    print("  • resource://interest-rates", file=banner)
+    print("\n" + "=" * 60, file=banner)
+    print(f"Starting MCP server ({transport.upper()} mode)...", file=banner)
+    print("Use Ctrl+C to stop", file=banner)
+    print("=" * 60, file=banner)
     
-    # Run the server in STDIO mode
-    # This is what MCPStdioTool connects to
-    mcp.run()
\ No newline at end of file
+    if transport == "stdio":
+        # Run the server in STDIO mode
+        # This is what MCPStdioTool connects to
+        mcp.run()
+    else:
+        # Run the server over HTTP on localhost
+        # This is what MCPStreamableHTTPTool connects to (http://127.0.0.1:<port>/mcp)
+        mcp.run(transport=transport, host="127.0.0.1", port=port)